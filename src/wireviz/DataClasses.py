@@ -1,10 +1,11 @@
 # -*- coding: utf-8 -*-
 
+from collections import Counter
 from typing import Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass, field, InitVar
 from pathlib import Path
 
-from wireviz.wv_helper import int2tuple, aspect_ratio
+from wireviz.wv_helper import int2tuple, index_map, intern_str, aspect_ratio
 from wireviz.wv_colors import Color, Colors, ColorMode, ColorScheme, COLOR_CODES
 
 
@@ -147,6 +148,8 @@ class Connector:
 
     def __post_init__(self) -> None:
 
+        self.name = intern_str(self.name)
+
         if isinstance(self.image, dict):
             self.image = Image(**self.image)
 
@@ -171,6 +174,11 @@ class Connector:
         if len(self.pins) != len(set(self.pins)):
             raise Exception('Pins are not unique')
 
+        # lookup tables for resolving pins and pin labels in Harness.connect()
+        self._pin_index = index_map(self.pins)
+        self._pinlabel_index = index_map(self.pinlabels)
+        self._duplicate_pinlabels = {label for label, n in Counter(self.pinlabels).items() if n > 1}
+
         if self.show_name is None:
             self.show_name = not self.autogenerate # hide auto-generated designators by default
 
@@ -235,6 +243,8 @@ class Cable:
 
     def __post_init__(self) -> None:
 
+        self.name = intern_str(self.name)
+
         if isinstance(self.image, dict):
             self.image = Image(**self.image)
 
@@ -296,6 +306,12 @@ class Cable:
                 raise Exception('Unknown number of wires. Must specify wirecount or colors (implicit length)')
             self.wirecount = len(self.colors)
 
+        # lookup tables for resolving wire colors and labels in Harness.connect()
+        self._color_index = index_map(self.colors)
+        self._wirelabel_index = index_map(self.wirelabels)
+        self._duplicate_colors = {color for color, n in Counter(self.colors).items() if n > 1}
+        self._duplicate_wirelabels = {label for label, n in Counter(self.wirelabels).items() if n > 1}
+
         if self.wirelabels:
             if self.shield and 's' in self.wirelabels:
                 raise Exception('"s" may not be used as a wire label for a shielded cable.')
@@ -351,3 +367,7 @@ class Connection:
     via_port: Wire
     to_name: Optional[Designator]
     to_port: Optional[PinIndex]
+
+    def __post_init__(self) -> None:
+        self.from_name = intern_str(self.from_name)
+        self.to_name = intern_str(self.to_name)
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
-from graphviz import Graph
+from graphviz import Graph, view as graphviz_view
+from concurrent.futures import ThreadPoolExecutor
 from collections import Counter
 from typing import Any, List, Union
 from dataclasses import dataclass
@@ -15,7 +16,7 @@ from wireviz.wv_gv_html import nested_html_table, \
     html_bgcolor_attr, html_bgcolor, html_colorbar, \
     html_image, html_caption, remove_links, html_line_breaks
 from wireviz.wv_bom import pn_info_string, component_table_entry, \
-    get_additional_component_table, bom_list, generate_bom, \
+    get_additional_component_table, bom_list, bom_index, generate_bom, \
     HEADER_PN, HEADER_MPN, HEADER_SPN
 from wireviz.wv_html import generate_html_output
 from wireviz.wv_helper import awg_equiv, mm2_equiv, tuplelist2tsv, flatten2d, \
@@ -32,58 +33,74 @@ class Harness:
         self.connectors = {}
         self.cables = {}
         self._bom = []  # Internal Cache for generated bom
+        self._bom_index = {}  # Internal Cache for bom ids by bom key
+        self._graph = None  # Internal Cache for generated graph
+        self._rendered = {}  # Internal Cache for graph output per format
         self.additional_bom_items = []
 
+    def _invalidate(self) -> None:
+        """Discard cached output that depends on the harness contents."""
+        self._bom = []
+        self._bom_index = {}
+        self._graph = None
+        self._rendered = {}
+
     def add_connector(self, name: str, *args, **kwargs) -> None:
-        self.connectors[name] = Connector(name, *args, **kwargs)
+        self._invalidate()
+        connector = Connector(name, *args, **kwargs)
+        self.connectors[connector.name] = connector  # use the interned designator as key
 
     def add_cable(self, name: str, *args, **kwargs) -> None:
-        self.cables[name] = Cable(name, *args, **kwargs)
+        self._invalidate()
+        cable = Cable(name, *args, **kwargs)
+        self.cables[cable.name] = cable
 
     def add_bom_item(self, item: dict) -> None:
+        self._invalidate()
         self.additional_bom_items.append(item)
 
     def connect(self, from_name: str, from_pin: (int, str), via_name: str, via_wire: (int, str), to_name: str, to_pin: (int, str)) -> None:
+        self._invalidate()
         # check from and to connectors
         for (name, pin) in zip([from_name, to_name], [from_pin, to_pin]):
             if name is not None and name in self.connectors:
                 connector = self.connectors[name]
                 # check if provided name is ambiguous
-                if pin in connector.pins and pin in connector.pinlabels:
-                    if connector.pins.index(pin) != connector.pinlabels.index(pin):
+                if pin in connector._pin_index and pin in connector._pinlabel_index:
+                    if connector._pin_index[pin] != connector._pinlabel_index[pin]:
                         raise Exception(f'{name}:{pin} is defined both in pinlabels and pins, for different pins.')
                     # TODO: Maybe issue a warning if present in both lists but referencing the same pin?
-                if pin in connector.pinlabels:
-                    if connector.pinlabels.count(pin) > 1:
+                if pin in connector._pinlabel_index:
+                    if pin in connector._duplicate_pinlabels:
                         raise Exception(f'{name}:{pin} is defined more than once.')
-                    index = connector.pinlabels.index(pin)
+                    index = connector._pinlabel_index[pin]
                     pin = connector.pins[index] # map pin name to pin number
                     if name == from_name:
                         from_pin = pin
                     if name == to_name:
                         to_pin = pin
-                if not pin in connector.pins:
+                if not pin in connector._pin_index:
                     raise Exception(f'{name}:{pin} not found.')
 
         # check via cable
         if via_name in self.cables:
             cable = self.cables[via_name]
             # check if provided name is ambiguous
-            if via_wire in cable.colors and via_wire in cable.wirelabels:
-                if cable.colors.index(via_wire) != cable.wirelabels.index(via_wire):
+            if via_wire in cable._color_index and via_wire in cable._wirelabel_index:
+                if cable._color_index[via_wire] != cable._wirelabel_index[via_wire]:
                     raise Exception(f'{via_name}:{via_wire} is defined both in colors and wirelabels, for different wires.')
                 # TODO: Maybe issue a warning if present in both lists but referencing the same wire?
-            if via_wire in cable.colors:
-                if cable.colors.count(via_wire) > 1:
+            if via_wire in cable._color_index:
+                if via_wire in cable._duplicate_colors:
                     raise Exception(f'{via_name}:{via_wire} is used for more than one wire.')
-                via_wire = cable.colors.index(via_wire) + 1  # list index starts at 0, wire IDs start at 1
-            elif via_wire in cable.wirelabels:
-                if cable.wirelabels.count(via_wire) > 1:
+                via_wire = cable._color_index[via_wire] + 1  # list index starts at 0, wire IDs start at 1
+            elif via_wire in cable._wirelabel_index:
+                if via_wire in cable._duplicate_wirelabels:
                     raise Exception(f'{via_name}:{via_wire} is used for more than one wire.')
-                via_wire = cable.wirelabels.index(via_wire) + 1  # list index starts at 0, wire IDs start at 1
+                via_wire = cable._wirelabel_index[via_wire] + 1  # list index starts at 0, wire IDs start at 1
 
-        from_pin_id = self.connectors[from_name].pins.index(from_pin) if from_pin is not None else None
-        to_pin_id = self.connectors[to_name].pins.index(to_pin) if to_pin is not None else None
+        from_pin_id = self.connectors[from_name]._pin_index[from_pin] if from_pin is not None else None
+        to_pin_id = self.connectors[to_name]._pin_index[to_pin] if to_pin is not None else None
 
         self.cables[via_name].connect(from_name, from_pin_id, via_wire, to_name, to_pin_id)
         if from_name in self.connectors:
@@ -117,6 +134,11 @@ class Harness:
                 if connection_color.to_port is not None:  # connect to right
                     self.connectors[connection_color.to_name].ports_left = True
 
+        # node fill colors only depend on the options, so translate them once for all nodes
+        connector_fillcolor = translate_color(self.options.bgcolor_connector, "HEX")
+        cable_style = ('filled', translate_color(self.options.bgcolor_cable, "HEX"))
+        bundle_style = ('filled,dashed', translate_color(self.options.bgcolor_bundle, "HEX"))
+
         for connector in self.connectors.values():
 
             # If no wires connected (except maybe loop wires)?
@@ -175,7 +197,7 @@ class Harness:
 
             html = '\n'.join(html)
             dot.node(connector.name, label=f'<\n{html}\n>', shape='box', style='filled',
-                     fillcolor=translate_color(self.options.bgcolor_connector, "HEX"))
+                     fillcolor=connector_fillcolor)
 
             if len(connector.loops) > 0:
                 dot.attr('edge', color='#000000:#ffffff:#000000')
@@ -187,11 +209,12 @@ class Harness:
                     loop_dir = 'e'
                 else:
                     raise Exception('No side for loops')
-                for loop in connector.loops:
-                    dot.edge(f'{connector.name}:p{loop[0]}{loop_side}:{loop_dir}',
-                             f'{connector.name}:p{loop[1]}{loop_side}:{loop_dir}')
+                dot.edges((f'{connector.name}:p{loop[0]}{loop_side}:{loop_dir}',
+                           f'{connector.name}:p{loop[1]}{loop_side}:{loop_dir}') for loop in connector.loops)
 
 
+        wire_end_pattern = re.compile(r'<!-- \w+_(?:in|out) -->')
+
         # determine if there are double- or triple-colored wires in the harness;
         # if so, pad single-color wires to make all wires of equal thickness
         pad = any(len(colorstr) > 2 for cable in self.cables.values() for colorstr in cable.colors)
@@ -236,9 +259,15 @@ class Harness:
             html.extend(nested_html_table(rows, html_bgcolor_attr(cable.bgcolor)))
 
             wirehtml = []
+            wire_edge_colors = []  # edge color of each wire, reused when drawing the connections below
             wirehtml.append('<table border="0" cellspacing="0" cellborder="0">')  # conductor table
             wirehtml.append('   <tr><td>&nbsp;</td></tr>')
 
+            # for bundles individual wires can have part information, given as lists
+            # (validated in Cable.__post_init__); decide once per cable instead of per wire
+            show_wire_parts = cable.category == 'bundle' and any(isinstance(idfield, list) for idfield in
+                [cable.pn, cable.manufacturer, cable.mpn, cable.supplier, cable.spn])
+
             for i, (connection_color, wirelabel) in enumerate(zip_longest(cable.colors, cable.wirelabels), 1):
                 wirehtml.append('   <tr>')
                 wirehtml.append(f'    <td><!-- {i}_in --></td>')
@@ -259,6 +288,7 @@ class Harness:
                 wirehtml.append('   </tr>')
 
                 bgcolors = ['#000000'] + get_color_hex(connection_color, pad=pad) + ['#000000']
+                wire_edge_colors.append(':'.join(bgcolors))
                 wirehtml.append(f'   <tr>')
                 wirehtml.append(f'    <td colspan="3" border="0" cellspacing="0" cellpadding="0" port="w{i}" height="{(2 * len(bgcolors))}">')
                 wirehtml.append('     <table cellspacing="0" cellborder="0" border="0">')
@@ -267,7 +297,7 @@ class Harness:
                 wirehtml.append('     </table>')
                 wirehtml.append('    </td>')
                 wirehtml.append('   </tr>')
-                if cable.category == 'bundle':  # for bundles individual wires can have part information
+                if show_wire_parts:
                     # create a list of wire parameters
                     wireidentification = []
                     if isinstance(cable.pn, list):
@@ -313,18 +343,19 @@ class Harness:
             html = [row.replace('<!-- wire table -->', '\n'.join(wirehtml)) for row in html]
 
             # connections
+            wire_ends = {}  # text to fill into the <!-- {wire}_in/out --> placeholders of the wire table
             for connection in cable.connections:
                 if isinstance(connection.via_port, int):  # check if it's an actual wire and not a shield
-                    dot.attr('edge', color=':'.join(['#000000'] + wv_colors.get_color_hex(cable.colors[connection.via_port - 1], pad=pad) + ['#000000']))
+                    color = wire_edge_colors[connection.via_port - 1]
                 else:  # it's a shield connection
                     # shield is shown with specified color and black borders, or as a thin black wire otherwise
-                    dot.attr('edge', color=':'.join(['#000000', shield_color_hex, '#000000']) if isinstance(cable.shield, str) else '#000000')
+                    color = ':'.join(['#000000', shield_color_hex, '#000000']) if isinstance(cable.shield, str) else '#000000'
                 if connection.from_port is not None:  # connect to left
                     from_connector = self.connectors[connection.from_name]
                     from_port = f':p{connection.from_port+1}r' if from_connector.style != 'simple' else ''
                     code_left_1 = f'{connection.from_name}{from_port}:e'
                     code_left_2 = f'{cable.name}:w{connection.via_port}:w'
-                    dot.edge(code_left_1, code_left_2)
+                    dot.edge(code_left_1, code_left_2, color=color)
                     if from_connector.show_name:
                         from_info = [str(connection.from_name), str(self.connectors[connection.from_name].pins[connection.from_port])]
                         if from_connector.pinlabels:
@@ -334,13 +365,13 @@ class Harness:
                         from_string = ':'.join(from_info)
                     else:
                         from_string = ''
-                    html = [row.replace(f'<!-- {connection.via_port}_in -->', from_string) for row in html]
+                    wire_ends.setdefault(f'<!-- {connection.via_port}_in -->', from_string)
                 if connection.to_port is not None:  # connect to right
                     to_connector = self.connectors[connection.to_name]
                     code_right_1 = f'{cable.name}:w{connection.via_port}:e'
                     to_port = f':p{connection.to_port+1}l' if self.connectors[connection.to_name].style != 'simple' else ''
                     code_right_2 = f'{connection.to_name}{to_port}:w'
-                    dot.edge(code_right_1, code_right_2)
+                    dot.edge(code_right_1, code_right_2, color=color)
                     if to_connector.show_name:
                         to_info = [str(connection.to_name), str(self.connectors[connection.to_name].pins[connection.to_port])]
                         if to_connector.pinlabels:
@@ -350,13 +381,14 @@ class Harness:
                         to_string = ':'.join(to_info)
                     else:
                         to_string = ''
-                    html = [row.replace(f'<!-- {connection.via_port}_out -->', to_string) for row in html]
+                    wire_ends.setdefault(f'<!-- {connection.via_port}_out -->', to_string)
 
-            style, bgcolor = ('filled,dashed', self.options.bgcolor_bundle) if cable.category == 'bundle' else \
-                             ('filled',        self.options.bgcolor_cable)
+            style, fillcolor = bundle_style if cable.category == 'bundle' else cable_style
             html = '\n'.join(html)
+            # fill in all wire ends in one pass instead of rewriting the whole table per connection
+            html = wire_end_pattern.sub(lambda match: wire_ends.get(match[0], match[0]), html)
             dot.node(cable.name, label=f'<\n{html}\n>', shape='box',
-                     style=style, fillcolor=translate_color(bgcolor, "HEX"))
+                     style=style, fillcolor=fillcolor)
 
         def typecheck(name: str, value: Any, expect: type) -> None:
             if not isinstance(value, expect):
@@ -373,10 +405,11 @@ class Harness:
                     typecheck(f'tweak.override.{k}.{a} value', v, (str, type(None)))
 
             # Override generated attributes of selected entries matching tweak.override.
+            # Find a possibly quoted keyword after leading TAB(s) and followed by [ ].
+            keyword_pattern = re.compile(r'^\t*(")?((?(1)[^"]|[^ "])+)(?(1)") \[.*\]$', re.S)
             for i, entry in enumerate(dot.body):
                 if isinstance(entry, str):
-                    # Find a possibly quoted keyword after leading TAB(s) and followed by [ ].
-                    match = re.match(r'^\t*(")?((?(1)[^"]|[^ "])+)(?(1)") \[.*\]$', entry, re.S)
+                    match = keyword_pattern.match(entry)
                     keyword = match and match[2]
                     if keyword in self.tweak.override.keys():
                         for attr, value in self.tweak.override[keyword].items():
@@ -411,39 +444,65 @@ class Harness:
 
         return dot
 
+    @property
+    def graph(self) -> Graph:
+        if self._graph is None:
+            self._graph = self.create_graph()
+        return self._graph
+
+    def render(self, fmt: str) -> bytes:
+        """Return the graph rendered by Graphviz in the given format, running dot at most once per format."""
+        if fmt not in self._rendered:
+            self._rendered[fmt] = self.graph.pipe(format=fmt)
+        return self._rendered[fmt]
+
     @property
     def png(self):
-        from io import BytesIO
-        graph = self.create_graph()
-        data = BytesIO()
-        data.write(graph.pipe(format='png'))
-        data.seek(0)
-        return data.read()
+        return self.render('png')
 
     @property
     def svg(self):
-        from io import BytesIO
-        graph = self.create_graph()
-        data = BytesIO()
-        data.write(graph.pipe(format='svg'))
-        data.seek(0)
-        return data.read()
+        return self.render('svg')
 
     def output(self, filename: (str, Path), view: bool = False, cleanup: bool = True, fmt: tuple = ('pdf', )) -> None:
+        filename = Path(filename)
+        filename.parent.mkdir(parents=True, exist_ok=True)  # Graph.render() used to create it
+        # Append extensions to the full name; with_suffix() would cut off any dotted part of the name.
+        def output_file(extension: str) -> Path:
+            return filename.with_name(f'{filename.name}.{extension}')
+
+        graph = self.graph
+        formats = list(dict.fromkeys([*fmt, 'svg']))  # HTML embeds the SVG
+        # dot runs as a separate process per format, so render all formats
+        # side by side in the background while the BOM is prepared
+        with ThreadPoolExecutor(max_workers=len(formats)) as executor:
+            renderings = [executor.submit(self.render, f) for f in formats]
+            bomlist = bom_list(self.bom())
+            bomtsv = tuplelist2tsv(bomlist)
+            for rendering in renderings:
+                rendering.result()  # wait for dot, re-raising any error
         # graphical output
-        graph = self.create_graph()
-        for f in fmt:
-            graph.format = f
-            graph.render(filename=filename, view=view, cleanup=cleanup)
-        graph.save(filename=f'{filename}.gv')
+        for f in dict.fromkeys(fmt):  # skip duplicate formats
+            image_file = output_file(f)
+            image_file.write_bytes(self.render(f))
+            if view:
+                graphviz_view(image_file)
+        if not cleanup:  # keep the Graphviz source file like Graph.render() does
+            graph.save(filename=filename)
+        graph.save(filename=output_file('gv'))
         # bom output
-        bomlist = bom_list(self.bom())
-        with open_file_write(f'{filename}.bom.tsv') as file:
-            file.write(tuplelist2tsv(bomlist))
+        with open_file_write(output_file('bom.tsv')) as file:
+            file.write(bomtsv)
         # HTML output
-        generate_html_output(filename, bomlist, self.metadata, self.options)
+        # reuse the SVG rendered above instead of reading it back from disk
+        generate_html_output(filename, bomlist, self.metadata, self.options, self.render('svg').decode('UTF-8'))
 
     def bom(self):
         if not self._bom:
             self._bom = generate_bom(self)
         return self._bom
+
+    def bom_index(self):
+        if not self._bom_index:
+            self._bom_index = bom_index(self.bom())
+        return self._bom_index
@@ -136,22 +136,24 @@ def parse(yaml_input: str, file_out: (str, Path) = None, return_types: (None, st
         for i, item in enumerate(connection):
             if isinstance(item, str):  # one single-pin component was specified
                 sublist = []
-                for i in range(1, itemcount + 1):
-                    if yaml_data['connectors'][item].get('autogenerate'):
+                attribs = yaml_data['connectors'][item]
+                if attribs.get('autogenerate'):
+                    for i in range(1, itemcount + 1):
                         autogenerated_ids[item] = autogenerated_ids.get(item, 0) + 1
                         new_id = f'_{item}_{autogenerated_ids[item]}'
-                        harness.add_connector(new_id, **yaml_data['connectors'][item])
+                        harness.add_connector(new_id, **attribs)
                         sublist.append([new_id, 1])
-                    else:
-                        sublist.append([item, 1])
+                else:
+                    sublist = [[item, 1] for i in range(itemcount)]
                 connection_list.append(sublist)
             elif isinstance(item, list):  # a list of single-pin components were specified
                 sublist = []
                 for subitem in item:
-                    if yaml_data['connectors'][subitem].get('autogenerate'):
+                    attribs = yaml_data['connectors'][subitem]
+                    if attribs.get('autogenerate'):
                         autogenerated_ids[subitem] = autogenerated_ids.get(subitem, 0) + 1
                         new_id = f'_{subitem}_{autogenerated_ids[subitem]}'
-                        harness.add_connector(new_id, **yaml_data['connectors'][subitem])
+                        harness.add_connector(new_id, **attribs)
                         sublist.append([new_id, 1])
                     else:
                         sublist.append([subitem, 1])
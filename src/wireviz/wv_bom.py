@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 
-from dataclasses import asdict
 from itertools import groupby
 from typing import Any, Dict, List, Optional, Tuple, Union
 
@@ -23,8 +22,7 @@ BOMEntry = Dict[BOMColumn, Union[str, int, float, List[str], None]]
 
 def optional_fields(part: Union[Connector, Cable, AdditionalComponent]) -> BOMEntry:
     """Return part field values for the optional BOM columns as a dict."""
-    part = asdict(part)
-    return {field: part.get(field) for field in BOM_COLUMNS_OPTIONAL}
+    return {field: getattr(part, field, None) for field in BOM_COLUMNS_OPTIONAL}
 
 def get_additional_component_table(harness: "Harness", component: Union[Connector, Cable]) -> List[str]:
     """Return a list of diagram node table row strings with additional components."""
@@ -38,7 +36,7 @@ def get_additional_component_table(harness: "Harness", component: Union[Connecto
                 'bgcolor': part.bgcolor,
             }
             if harness.options.mini_bom_mode:
-                id = get_bom_index(harness.bom(), bom_entry_key({**asdict(part), 'description': part.description}))
+                id = get_bom_index(harness.bom_index(), bom_entry_key({'description': part.description, 'unit': part.unit, **optional_fields(part)}))
                 rows.append(component_table_entry(f'#{id} ({part.type.rstrip()})', **common_args))
             else:
                 rows.append(component_table_entry(part.description, **common_args, **optional_fields(part)))
@@ -65,7 +63,6 @@ def bom_entry_key(entry: BOMEntry) -> BOMKey:
 
 def generate_bom(harness: "Harness") -> List[BOMEntry]:
     """Return a list of BOM entries generated from the harness."""
-    from wireviz.Harness import Harness  # Local import to avoid circular imports
     bom_entries = []
     # connectors
     for connector in harness.connectors.values():
@@ -101,14 +98,18 @@ def generate_bom(harness: "Harness") -> List[BOMEntry]:
                 })
             else:
                 # add each wire from the bundle to the bom
+                # everything except the color and the part data given as lists is shared by all wires
+                cable_fields = optional_fields(cable)
+                wire_fields = [k for k, v in cable_fields.items() if isinstance(v, list)]
+                wire_description = ('Wire'
+                                    + (f', {cable.type}' if cable.type else '')
+                                    + (f', {cable.gauge} {cable.gauge_unit}' if cable.gauge else ''))
+                designators = cable.name if cable.show_name else None
                 for index, color in enumerate(cable.colors):
-                    description = ('Wire'
-                                   + (f', {cable.type}' if cable.type else '')
-                                   + (f', {cable.gauge} {cable.gauge_unit}' if cable.gauge else '')
-                                   + (f', {translate_color(color, harness.options.color_mode)}' if color else ''))
+                    description = wire_description + (f', {translate_color(color, harness.options.color_mode)}' if color else '')
                     bom_entries.append({
-                        'description': description, 'qty': cable.length, 'unit': cable.length_unit, 'designators': cable.name if cable.show_name else None,
-                        **{k: index_if_list(v, index) for k, v in optional_fields(cable).items()},
+                        'description': description, 'qty': cable.length, 'unit': cable.length_unit, 'designators': designators,
+                        **cable_fields, **{k: cable_fields[k][index] for k in wire_fields},
                     })
 
         # add cable/bundles aditional components to bom
@@ -124,19 +125,30 @@ def generate_bom(harness: "Harness") -> List[BOMEntry]:
     bom = []
     for _, group in groupby(sorted(bom_entries, key=bom_entry_key), key=bom_entry_key):
         group_entries = list(group)
-        designators = sum((make_list(entry.get('designators')) for entry in group_entries), [])
-        total_qty = sum(entry.get('qty', 1) for entry in group_entries)
-        bom.append({**group_entries[0], 'qty': round(total_qty, 3), 'designators': sorted(set(designators))})
+        designators = set()
+        total_qty = 0
+        for entry in group_entries:
+            entry_designators = entry.get('designators')
+            if isinstance(entry_designators, list):
+                designators.update(entry_designators)
+            elif entry_designators is not None:  # single designator, avoid wrapping it in a list
+                designators.add(entry_designators)
+            total_qty += entry.get('qty', 1)
+        bom.append({**group_entries[0], 'qty': round(total_qty, 3), 'designators': sorted(designators)})
 
     # add an incrementing id to each bom entry
     return [{**entry, 'id': index} for index, entry in enumerate(bom, 1)]
 
-def get_bom_index(bom: List[BOMEntry], target: BOMKey) -> int:
+def bom_index(bom: List[BOMEntry]) -> Dict[BOMKey, int]:
+    """Return a dict mapping the key of each BOM entry to its id."""
+    return {bom_entry_key(entry): entry['id'] for entry in bom}
+
+def get_bom_index(index: Dict[BOMKey, int], target: BOMKey) -> int:
     """Return id of BOM entry or raise exception if not found."""
-    for entry in bom:
-        if bom_entry_key(entry) == target:
-            return entry['id']
-    raise Exception('Internal error: No BOM entry found matching: ' + '|'.join(target))
+    try:
+        return index[target]
+    except KeyError:
+        raise Exception('Internal error: No BOM entry found matching: ' + '|'.join(target))
 
 def bom_list(bom: List[BOMEntry]) -> List[List[str]]:
     """Return list of BOM rows as lists of column strings with headings in top row."""
@@ -190,10 +202,6 @@ def pn_info_string(header: str, name: Optional[str], number: Optional[str]) -> O
     else:
         return None
 
-def index_if_list(value: Any, index: int) -> Any:
-    """Return the value indexed if it is a list, or simply the value otherwise."""
-    return value[index] if isinstance(value, list) else value
-
 def make_list(value: Any) -> list:
     """Return value if a list, empty list if None, or single element list otherwise."""
     return value if isinstance(value, list) else [] if value is None else [value]
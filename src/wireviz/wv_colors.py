@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+from functools import lru_cache
 from typing import Dict, List
 
 COLOR_CODES = {
@@ -160,6 +161,7 @@ def get_color_translation(translate: Dict[Color, str], input: Colors) -> List[st
            [translate.get(input[i:i+2], '??') for i in range(0, len(input), 2)]
 
 
+@lru_cache(maxsize=None)  # Harnesses reuse a handful of colors and color modes many times
 def translate_color(input: Colors, color_mode: ColorMode) -> str:
     if input == '' or input is None:
         return ''
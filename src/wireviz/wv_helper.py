@@ -2,6 +2,7 @@
 
 from typing import List
 import re
+import sys
 
 awg_equiv_table = {
     '0.09': '28',
@@ -73,6 +74,14 @@ def int2tuple(inp):
     return output
 
 
+def index_map(inp):
+    # map each item to the index of its first occurrence, matching list.index()
+    output = {}
+    for i, item in enumerate(inp):
+        output.setdefault(item, i)
+    return output
+
+
 def flatten2d(inp):
     return [[str(item) if not isinstance(item, List) else ', '.join(item) for item in row] for row in inp]
 
@@ -87,14 +96,21 @@ def tuplelist2tsv(inp, header=None):
     return output
 
 
+link_pattern = re.compile(r'<[aA] [^>]*>([^<]*)</[aA]>')
+
 def remove_links(inp):
-    return re.sub(r'<[aA] [^>]*>([^<]*)</[aA]>', r'\1', inp) if isinstance(inp, str) else inp
+    return link_pattern.sub(r'\1', inp) if isinstance(inp, str) else inp
 
 
 def clean_whitespace(inp):
     return ' '.join(inp.split()).replace(' ,', ',') if isinstance(inp, str) else inp
 
 
+def intern_str(inp):
+    # designators are repeated in every connection and BOM line; share one string object each
+    return sys.intern(inp) if isinstance(inp, str) else inp
+
+
 def open_file_read(filename):
     # TODO: Intelligently determine encoding
     return open(filename, 'r', encoding='UTF-8')
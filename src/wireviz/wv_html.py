@@ -6,9 +6,9 @@ import re
 
 from wireviz import __version__, APP_NAME, APP_URL, wv_colors
 from wireviz.DataClasses import Metadata, Options
-from wireviz.wv_helper import flatten2d, open_file_read, open_file_write
+from wireviz.wv_helper import flatten2d, open_file_write
 
-def generate_html_output(filename: Union[str, Path], bom_list: List[List[str]], metadata: Metadata, options: Options):
+def generate_html_output(filename: Union[str, Path], bom_list: List[List[str]], metadata: Metadata, options: Options, svg: str):
     with open_file_write(f'{filename}.html') as file:
         file.write('<!DOCTYPE html>\n')
         file.write('<html lang="en"><head>\n')
@@ -23,13 +23,10 @@ def generate_html_output(filename: Union[str, Path], bom_list: List[List[str]],
         if description:
             file.write(f'<p>{description}</p>\n')
         file.write('<h2>Diagram</h2>\n')
-        with open_file_read(f'{filename}.svg') as svg:
-            file.write(re.sub(
-                '^<[?]xml [^?>]*[?]>[^<]*<!DOCTYPE [^>]*>',
-                '<!-- XML and DOCTYPE declarations from SVG file removed -->',
-                svg.read(1024), 1))
-            for svgdata in svg:
-                file.write(svgdata)
+        file.write(re.sub(
+            '^<[?]xml [^?>]*[?]>[^<]*<!DOCTYPE [^>]*>',
+            '<!-- XML and DOCTYPE declarations from SVG file removed -->',
+            svg, 1))
 
         file.write('<h2>Bill of Materials</h2>\n')
         listy = flatten2d(bom_list)